@@ -1,22 +1,38 @@
+import numpy as np
 import pandas as pd
-import openpyxl
+import xlsxwriter
 import requests
-from bs4 import BeautifulSoup
+import http.cookiejar
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+from lxml import etree
 from urllib.parse import urlparse
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 import time
+import copy
+import threading
+import socket
+from collections import OrderedDict
 import logging
 from datetime import datetime
+from dataclasses import dataclass, field, asdict
 import os
-from flask import Flask, render_template, request, send_file, session, redirect, url_for
-from io import BytesIO
-import html
+import uuid
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, render_template, request, send_file, session, redirect, url_for, jsonify
+from flask_compress import Compress
+from jinja2.utils import htmlsafe_json_dumps
+from tempfile import SpooledTemporaryFile
+import re
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Configure application
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', os.urandom(24))
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
+# Compress HTML/JSON responses; the xlsx report is already a zip and is sent as-is
+Compress(app)
 
 # Logging configuration
 logging.basicConfig(
@@ -34,6 +50,133 @@ MAX_SCAN_TIME = 30  # seconds
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 REQUEST_TIMEOUT = 20
 MAX_REDIRECTS = 5
+MAX_CONCURRENT_SCANS = 20
+MAX_SCANS_PER_HOST = 4
+MAX_BATCH_URLS = 20
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes fed to the incremental parser per read
+MAX_PAGE_BYTES = 10 * 1024 * 1024  # pages beyond this are scanned only up to the cap
+HTTP_POOL_SIZE = 50
+SCAN_CACHE_TTL = 3600  # seconds
+SCAN_CACHE_SIZE = 256
+SCAN_WORKERS = 8  # background scan jobs running at once
+SCAN_JOB_TTL = 3600  # seconds a finished job stays retrievable
+MAX_SCAN_JOBS = 1024  # finished jobs kept before the oldest are dropped
+MAX_PENDING_SCANS = 4 * SCAN_WORKERS  # queued or running scans before new ones are turned away
+REPORT_SPOOL_SIZE = 8 * 1024 * 1024  # reports larger than this spill to a temp file
+
+# Lookup tables built once instead of per request or per element
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+_ARIA_ATTR = re.compile(r'aria-')
+_SECURITY_HEADERS = frozenset(('strict-transport-security', 'content-security-policy', 'x-frame-options'))
+_TEXT_TAGS = frozenset(('p', 'h1', 'h2', 'h3'))
+_TEXT_CONTENT = etree.XPath('string()')
+_CHART_COLORS = ('#e74c3c', '#e67e22', '#f1c40f', '#2ecc71', '#27ae60')
+
+# Order of the feature tuple consumed by _score_core and of the scores it returns
+SCORE_FEATURES = (
+    'load_time', 'page_size_kb', 'requests', 'dom_depth',
+    'https', 'hsts', 'content_security_policy', 'x_frame_options',
+    'title_length', 'description_length', 'viewport', 'canonical', 'og_tags', 'has_favicon',
+    'stylesheets', 'images', 'alt_text_images', 'lang_attribute', 'aria_attributes', 'word_count'
+)
+SCORED_CATEGORIES = (
+    'Performance & Speed',
+    'Security & Compliance',
+    'SEO & Visibility',
+    'Mobile Responsiveness',
+    'First Impressions & Branding',
+    'Content Quality',
+    'Accessibility'
+)
+
+# Shared HTTP session so connections and TLS sessions are reused across scans
+_SESSION = requests.Session()
+_SESSION.max_redirects = MAX_REDIRECTS
+# Scans belong to different users, so cookies set by one site must not be replayed on later scans
+_SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=HTTP_POOL_SIZE,
+    pool_maxsize=HTTP_POOL_SIZE,
+    # Only retry the listed gateway errors and a refused connect; retrying timeouts or sleeping
+    # for a server's Retry-After would hold a scan worker beyond every time limit
+    max_retries=Retry(total=2, connect=1, read=0, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                      respect_retry_after_header=False)
+)
+_SESSION.mount('https://', _HTTP_ADAPTER)
+_SESSION.mount('http://', _HTTP_ADAPTER)
+atexit.register(_SESSION.close)
+
+class TTLCache:
+    """Small thread-safe in-process cache with per-entry expiry and LRU eviction
+
+    Entries for which the optional pinned(value) returns True are never evicted or
+    expired; an expired pinned entry gets a fresh TTL instead.
+    """
+
+    def __init__(self, maxsize, ttl, pinned=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.pinned = pinned
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_pinned(self, value):
+        return self.pinned is not None and self.pinned(value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            now = time.monotonic()
+            if expires < now:
+                if not self._is_pinned(value):
+                    del self._data[key]
+                    return default
+                self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                # Oldest first, skipping pinned entries; the cache may briefly exceed maxsize if all are pinned
+                for old_key in list(self._data):
+                    if len(self._data) <= self.maxsize:
+                        break
+                    if not self._is_pinned(self._data[old_key][1]):
+                        del self._data[old_key]
+
+# Last results per URL with the validators needed to revalidate them
+_SCAN_CACHE = TTLCache(SCAN_CACHE_SIZE, SCAN_CACHE_TTL)
+
+# Scans run in the background so web requests return immediately; jobs are looked up by id
+_SCAN_POOL = ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix='scan')
+# Jobs still queued or running are pinned so their pending pages never lose them
+_SCAN_JOBS = TTLCache(MAX_SCAN_JOBS, SCAN_JOB_TTL, pinned=lambda job: not job.done())
+# Batches are lists of per-URL jobs on the same pool, pinned until every one of them has finished
+_BATCH_JOBS = TTLCache(MAX_SCAN_JOBS, SCAN_JOB_TTL, pinned=lambda jobs: not all(job.done() for job in jobs))
+# One slot per queued or running scan, so a flood of submissions cannot grow the queue without bound
+_SCAN_SLOTS = threading.BoundedSemaphore(MAX_PENDING_SCANS)
+
+def submit_scans(fn, items):
+    """Queue fn(item) on the scan pool for every item, or return None if there is not room for all of them"""
+    items = list(items)
+    acquired = 0
+    while acquired < len(items) and _SCAN_SLOTS.acquire(blocking=False):
+        acquired += 1
+    if acquired < len(items):
+        for _ in range(acquired):
+            _SCAN_SLOTS.release()
+        return None
+
+    futures = [_SCAN_POOL.submit(fn, item) for item in items]
+    for future in futures:
+        future.add_done_callback(lambda _: _SCAN_SLOTS.release())
+    return futures
 
 # Enhanced scoring categories
 CATEGORIES = {
@@ -85,6 +228,13 @@ CATEGORIES = {
         "Secure with minor improvements needed.",
         "Fully secure and compliant. No changes needed."
     ],
+    "Content Quality": [
+        "No meaningful content. Recommend writing substantive page copy.",
+        "Thin content. Suggest expanding copy to answer visitor questions.",
+        "Adequate content. Recommend adding depth and clearer headings.",
+        "Rich content. Suggest keeping it fresh and well structured.",
+        "Excellent content. No improvements needed."
+    ],
     "Accessibility": [
         "No accessibility. Recommend WCAG audit and full compliance plan.",
         "Major issues (contrast, keyboard nav). Recommend improvements.",
@@ -101,46 +251,73 @@ CATEGORIES = {
     ]
 }
 
+# CATEGORIES normalized once: a recommendation ladder and a weight for every category
+_RECS, _WEIGHTS = {}, {}
+for _category, _value in CATEGORIES.items():
+    if isinstance(_value, dict):
+        _RECS[_category] = tuple(_value['scores'])
+        _WEIGHTS[_category] = _value.get('weight', 1.0)
+    else:
+        _RECS[_category] = tuple(_value)
+        _WEIGHTS[_category] = 1.0
+_NO_RECOMMENDATION = ("No recommendation available",) * 5
+
+@dataclass(slots=True)
+class Basic:
+    load_time: float = 0.0
+    scan_timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+@dataclass(slots=True)
+class Meta:
+    title: str = ''
+    title_length: int = 0
+    description: str = ''
+    viewport: bool = False
+    has_favicon: bool = False
+    canonical: str = ''
+    og_tags: dict = field(default_factory=dict)
+
+@dataclass(slots=True)
+class Resources:
+    images: int = 0
+    stylesheets: int = 0
+    scripts: int = 0
+
+@dataclass(slots=True)
+class Performance:
+    page_size_kb: float = 0.0
+    requests: int = 0
+    dom_elements: int = 0
+    dom_depth: int = 0
+    text_word_count: int | None = None  # None until the body has been parsed
+
+@dataclass(slots=True)
+class Security:
+    https: bool = False
+    hsts: bool = False
+    content_security_policy: bool = False
+    x_frame_options: bool = False
+
+@dataclass(slots=True)
+class Accessibility:
+    alt_text_images: int = 0
+    lang_attribute: bool = False
+    aria_attributes: int = 0
+
+@dataclass(slots=True)
+class ScanResults:
+    """Everything collected by one scan; convert with asdict() at JSON boundaries"""
+    basic: Basic = field(default_factory=Basic)
+    meta: Meta = field(default_factory=Meta)
+    resources: Resources = field(default_factory=Resources)
+    performance: Performance = field(default_factory=Performance)
+    security: Security = field(default_factory=Security)
+    accessibility: Accessibility = field(default_factory=Accessibility)
+    issues: list = field(default_factory=list)
+
 def initialize_results():
-    """Create a fully initialized results dictionary with all required keys"""
-    return {
-        'basic': {
-            'load_time': 0.0,
-            'scan_timestamp': datetime.now().isoformat()
-        },
-        'meta': {
-            'title': '',
-            'title_length': 0,
-            'description': '',
-            'viewport': False,
-            'has_favicon': False,
-            'canonical': '',
-            'og_tags': {}
-        },
-        'resources': {
-            'images': 0,
-            'stylesheets': 0,
-            'scripts': 0
-        },
-        'performance': {
-            'page_size_kb': 0.0,
-            'requests': 0,
-            'dom_elements': 0,
-            'dom_depth': 0
-        },
-        'security': {
-            'https': False,
-            'hsts': False,
-            'content_security_policy': False,
-            'x_frame_options': False
-        },
-        'accessibility': {
-            'alt_text_images': 0,
-            'lang_attribute': False,
-            'aria_attributes': 0
-        },
-        'issues': []
-    }
+    """Create a fully initialized results object with all required fields"""
+    return ScanResults()
 
 def validate_url(url):
     """Robust URL validation with sanitization"""
@@ -159,177 +336,333 @@ def validate_url(url):
         if '.' not in result.netloc or len(result.netloc) < 4:
             raise ValueError("Invalid domain format")
 
-        return html.escape(url)
+        return url.translate(_HTML_ESCAPE)
     except Exception as e:
-        logger.error(f"URL validation failed: {str(e)}")
+        logger.error("URL validation failed: %s", e)
         raise ValueError(f"Invalid URL: {str(e)}")
 
-def safe_html_parse(html_content):
-    """Robust HTML parsing with multiple fallbacks"""
-    parsers = ['lxml', 'html.parser', 'html5lib']
-    last_error = None
+def response_encoding(response):
+    """Charset from the Content-Type header, defaulting to UTF-8 when none is declared"""
+    # Passed to libxml2 as declared; it knows e.g. EUC-KR but not Python's euc_kr spelling
+    if 'charset' in response.headers.get('content-type', '').lower() and response.encoding:
+        return response.encoding
+    return 'utf-8'
 
-    for parser in parsers:
-        try:
-            soup = BeautifulSoup(html_content, parser)
-            if soup.find():
-                return soup
-        except Exception as e:
-            last_error = e
+def abort_response(response, timed_out):
+    """Unblock a body read stuck on a slow server by shutting its socket down"""
+    timed_out.set()
+    try:
+        # Shut down a duplicate of the response's descriptor; the reading thread keeps the original
+        with socket.socket(fileno=os.dup(response.raw.fileno())) as sock:
+            sock.shutdown(socket.SHUT_RDWR)
+    except (OSError, ValueError):
+        # Already closed or not socket-backed, so nothing is left to block on
+        pass
+
+def read_body(response, results, start_time):
+    """Yield body chunks, tracking page size and stopping at the size cap or once the scan time budget is spent"""
+    # read1 returns whatever has arrived instead of waiting for a full chunk, so a server
+    # trickling bytes still gets parsed; the timer covers a server that sends nothing at all
+    timed_out = threading.Event()
+    deadline = threading.Timer(max(0.0, start_time + MAX_SCAN_TIME - time.time()),
+                               abort_response, (response, timed_out))
+    deadline.daemon = True
+    deadline.start()
+
+    received = 0
+    try:
+        while not timed_out.is_set():
+            chunk = response.raw.read1(STREAM_CHUNK_SIZE, decode_content=True)
+            if not chunk:
+                break
+            received += len(chunk)
+            results.performance.page_size_kb += len(chunk) / 1024
+            yield chunk
+
+            if received >= MAX_PAGE_BYTES:
+                logger.warning("Page exceeded %s bytes, stopping with partial results", MAX_PAGE_BYTES)
+                results.issues.append(f"Page too large: only the first {MAX_PAGE_BYTES / 1048576:.1f} MB were scanned")
+                return
+    except (urllib3.exceptions.HTTPError, OSError, ValueError) as error:
+        # The aborted read surfaces as a broken stream; anything else is a real failure
+        if not timed_out.is_set():
+            raise requests.exceptions.ConnectionError(error) from error
+    finally:
+        deadline.cancel()
+
+    if timed_out.is_set():
+        logger.warning("Scan exceeded %ss, stopping with partial results", MAX_SCAN_TIME)
+        results.issues.append(f"Scan timeout: page not fully read within {MAX_SCAN_TIME}s, results are partial")
+
+def parse_events(chunks, encoding):
+    """Feed chunks through an incremental lxml parser, yielding (event, element) pairs"""
+    try:
+        parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+    except LookupError:
+        logger.warning("Unknown charset %r, decoding as UTF-8", encoding)
+        parser = etree.HTMLPullParser(events=('start', 'end'), encoding='utf-8')
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.read_events()
+
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        # Nothing parseable, e.g. an empty body
+        return
+    yield from parser.read_events()
+
+def extract_page_data(events, results):
+    """Collect page metrics from parser events, discarding each element once it is closed"""
+    meta, resources, accessibility = results.meta, results.resources, results.accessibility
+    title = description = canonical = lang = None
+    images = alt_images = stylesheets = scripts = aria = elements = 0
+    depth = max_depth = text_blocks = word_count = 0
+
+    for event, element in events:
+        if event == 'end':
+            depth -= 1
+            if element.tag == 'title' and title is None:
+                title = element.text or ''
+            elif element.tag in _TEXT_TAGS:
+                text_blocks -= 1
+                if not text_blocks:
+                    word_count += len(_TEXT_CONTENT(element).split())
+            if text_blocks:
+                # Keep inline children until the enclosing text block has been counted
+                continue
+
+            # Drop finished subtrees so memory stays flat however large the page is
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            # The root has no parent, though comments or PIs before it still count as its siblings
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
             continue
 
-    logger.warning(f"All parsers failed, returning empty soup. Last error: {str(last_error)}")
-    return BeautifulSoup("", 'html.parser')
+        depth += 1
+        elements += 1
+        max_depth = max(max_depth, depth)
+        tag = element.tag
+        if tag in _TEXT_TAGS:
+            text_blocks += 1
+
+        if tag == 'img':
+            images += 1
+            if 'alt' in element.attrib:
+                alt_images += 1
+        elif tag == 'script':
+            if 'src' in element.attrib:
+                scripts += 1
+        elif tag == 'link':
+            rel = element.get('rel', '').split()
+            if 'stylesheet' in rel:
+                stylesheets += 1
+            if 'icon' in rel:
+                meta.has_favicon = True
+            if 'canonical' in rel and canonical is None:
+                canonical = element.get('href', '')
+        elif tag == 'meta':
+            name = element.get('name')
+            if name == 'description' and description is None:
+                description = element.get('content', '')
+            elif name == 'viewport':
+                meta.viewport = True
+        elif tag == 'html' and lang is None:
+            lang = element.get('lang', '')
+
+        if any(map(_ARIA_ATTR.match, element.keys())):
+            aria += 1
+
+    meta.title = title or ''
+    meta.title_length = len(meta.title)
+    meta.description = description or ''
+    meta.canonical = canonical or ''
+
+    accessibility.alt_text_images = alt_images
+    accessibility.lang_attribute = bool(lang)
+    accessibility.aria_attributes = aria
+
+    resources.images = images
+    resources.stylesheets = stylesheets
+    resources.scripts = scripts
+
+    results.performance.dom_elements = elements
+    results.performance.dom_depth = max_depth
+    results.performance.text_word_count = word_count
 
 def scan_website(url):
     """Perform comprehensive website scan with complete error handling"""
     results = initialize_results()
 
-    required_keys = {
-        'performance': {'page_size_kb': 0.0, 'requests': 0, 'dom_depth': 0},
-        'basic': {'load_time': 0.0},
-    }
-    for section, defaults in required_keys.items():
-        results.setdefault(section, {})
-        for key, val in defaults.items():
-            if not isinstance(results[section].get(key), (int, float)):
-                results[section][key] = val
-
     try:
         validated_url = validate_url(url)
         headers = {'User-Agent': USER_AGENT}
 
+        # Revalidate a previous scan instead of re-downloading an unchanged page
+        cached = _SCAN_CACHE.get(validated_url)
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
         start_time = time.time()
-        logger.info(f"Starting scan of: {validated_url}")
+        logger.info("Starting scan of: %s", validated_url)
 
         try:
-            with requests.Session() as session:
-                session.max_redirects = MAX_REDIRECTS
-                response = session.get(
-                    validated_url,
-                    headers=headers,
-                    timeout=REQUEST_TIMEOUT,
-                    allow_redirects=True,
-                    stream=True
-                )
+            # Closing the response hands its connection back to the shared pool
+            with _SESSION.get(
+                validated_url,
+                headers=headers,
+                timeout=REQUEST_TIMEOUT,
+                allow_redirects=True,
+                stream=True
+            ) as response:
                 response.raise_for_status()
 
-                # Always capture these basic metrics
-                results['basic']['load_time'] = time.time() - start_time
-                content = response.content
-                results['performance']['page_size_kb'] = len(content) / 1024
-                results['security']['https'] = response.url.startswith('https://')
-
-                try:
-                    soup = safe_html_parse(content.decode('utf-8', errors='replace'))
-
-                    # Meta data extraction with safe defaults
-                    if soup.title:
-                        results['meta']['title'] = soup.title.string or ''
-                        results['meta']['title_length'] = len(results['meta']['title'])
-
-                    # Other meta tags with safe access
-                    meta_desc = soup.find('meta', attrs={'name': 'description'})
-                    results['meta']['description'] = meta_desc.get('content', '') if meta_desc else ''
+                if response.status_code == 304 and cached:
+                    logger.info("Page unchanged, reusing cached scan of: %s", validated_url)
+                    results = copy.deepcopy(cached['data'])
+                    results.basic.scan_timestamp = datetime.now().isoformat()
+                    results.basic.load_time = time.time() - start_time
+                    return {'status': 'success', 'data': results}
 
-                    results['meta']['viewport'] = bool(soup.find('meta', {'name': 'viewport'}))
-                    results['meta']['has_favicon'] = bool(soup.find('link', rel='icon'))
-
-                    canonical = soup.find('link', rel='canonical')
-                    results['meta']['canonical'] = canonical.get('href', '') if canonical else ''
-
-                    # Accessibility checks with safe defaults
-                    results['accessibility']['alt_text_images'] = len(soup.find_all('img', alt=True))
-
-                    html_tag = soup.find('html')
-                    results['accessibility']['lang_attribute'] = bool(html_tag.get('lang', '')) if html_tag else False
-                    results['accessibility']['aria_attributes'] = len(soup.find_all(lambda tag: any(attr.startswith('aria-') for attr in tag.attrs)))
-
-                    # Resources counting
-                    results['resources']['images'] = len(soup.find_all('img'))
-                    results['resources']['stylesheets'] = len(soup.find_all('link', rel='stylesheet'))
-                    results['resources']['scripts'] = len(soup.find_all('script', src=True))
+                # Always capture these basic metrics
+                results.basic.load_time = time.time() - start_time
+                results.security.https = response.url.startswith('https://')
 
-                    # Security headers
-                    headers = response.headers
-                    results['security']['hsts'] = 'strict-transport-security' in headers
-                    results['security']['content_security_policy'] = 'content-security-policy' in headers
-                    results['security']['x_frame_options'] = 'x-frame-options' in headers
+                # Security headers, matched against one lower-cased pass over the header names
+                present = _SECURITY_HEADERS.intersection(map(str.lower, response.headers))
+                results.security.hsts = 'strict-transport-security' in present
+                results.security.content_security_policy = 'content-security-policy' in present
+                results.security.x_frame_options = 'x-frame-options' in present
 
+                try:
+                    # Skip the body entirely when the server announces it is over the cap
+                    content_length = response.headers.get('Content-Length', '')
+                    if content_length.isdigit() and int(content_length) > MAX_PAGE_BYTES:
+                        results.performance.page_size_kb = int(content_length) / 1024
+                        results.issues.append(f"Page too large: {int(content_length) / 1048576:.1f} MB exceeds the "
+                                              f"{MAX_PAGE_BYTES / 1048576:.1f} MB scan limit, content not scanned")
+                    else:
+                        chunks = read_body(response, results, start_time)
+                        extract_page_data(parse_events(chunks, response_encoding(response)), results)
+
+                    # Only complete scans of pages with validators can be revalidated later
+                    etag, last_modified = response.headers.get('etag'), response.headers.get('last-modified')
+                    if (etag or last_modified) and not results.issues:
+                        _SCAN_CACHE.set(validated_url, {
+                            'etag': etag,
+                            'last_modified': last_modified,
+                            'data': copy.deepcopy(results)
+                        })
+
+                except requests.exceptions.RequestException:
+                    # The body is read while parsing; a dropped stream is a request failure
+                    raise
                 except Exception as parse_error:
-                    logger.error(f"HTML parsing error: {str(parse_error)}")
-                    results['issues'].append(f"HTML parsing error: {str(parse_error)}")
+                    logger.error("HTML parsing error: %s", parse_error)
+                    results.issues.append(f"HTML parsing error: {str(parse_error)}")
                     # Continue with partial results
 
         except requests.exceptions.RequestException as req_error:
-            logger.error(f"Request failed: {str(req_error)}")
-            results['issues'].append(f"Request failed: {str(req_error)}")
-            results['basic']['load_time'] = time.time() - start_time
-            results['performance']['page_size_kb'] = 0.0
-
-        # Final validation before return
-        perf = results.setdefault('performance', {})
-        page_size = perf.get('page_size_kb', 0.0)
-        if not isinstance(page_size, (int, float)):
-            logger.warning("Invalid page_size_kb detected or missing, resetting to 0.0")
-            perf['page_size_kb'] = 0.0
+            logger.error("Request failed: %s", req_error)
+            results.issues.append(f"Request failed: {str(req_error)}")
+            results.basic.load_time = time.time() - start_time
+            results.performance.page_size_kb = 0.0
 
         return {'status': 'success', 'data': results}
 
     except Exception as e:
-        logger.error(f"Scan error: {str(e)}", exc_info=True)
-        results['issues'].append(f"Scan error: {str(e)}")
-        results['performance']['page_size_kb'] = 0.0
+        logger.error("Scan error: %s", e, exc_info=True)
+        results.issues.append(f"Scan error: {str(e)}")
+        results.performance.page_size_kb = 0.0
         return {'status': 'error', 'message': str(e), 'data': results}
 
-def auto_score_website(analysis_data, response_text=None):
-    """Completely safe scoring with comprehensive validation"""
+def url_host(url):
+    """Lower-cased host of a possibly scheme-less URL, used to group requests per site"""
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    try:
+        return urlparse(url).netloc.lower()
+    except ValueError:
+        return url
+
+def scan_many(urls, concurrency=MAX_CONCURRENT_SCANS):
+    """Scan several websites concurrently, returning results in input order"""
+    urls = list(urls)
+    if not urls:
+        return []
+
+    # Cap parallel requests per host so a batch aimed at one site does not hammer it
+    host_limits = {url_host(url): threading.BoundedSemaphore(MAX_SCANS_PER_HOST) for url in urls}
+
+    def scan_limited(url):
+        with host_limits[url_host(url)]:
+            return scan_website(url)
+
+    # Scans are dominated by network latency, so overlapping them in threads
+    # brings a batch down to roughly the time of its slowest URL
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(urls))) as pool:
+        return list(pool.map(scan_limited, urls))
+
+def auto_score_website(analysis_data, word_count=None):
+    """Score a scan in every category"""
     # Initialize default structure if invalid input
-    if not isinstance(analysis_data, dict):
+    if not isinstance(analysis_data, ScanResults):
         logger.warning("Invalid analysis_data - initializing default structure")
         analysis_data = initialize_results()
 
-    # Ensure all sections exist with proper defaults
-    required_sections = {
-        'basic': {'load_time': 8.0},
-        'performance': {
-            'page_size_kb': 1000.0,
-            'requests': 30,
-            'dom_depth': 20
-        },
-        'security': {},
-        'meta': {},
-        'accessibility': {},
-        'resources': {}
-    }
-
-    for section, defaults in required_sections.items():
-        analysis_data.setdefault(section, {})
-        for key, default_value in defaults.items():
-            # Special handling for page_size_kb
-            if key == 'page_size_kb':
-                current_val = analysis_data[section].get(key)
-                if not isinstance(current_val, (int, float)):
-                    logger.warning(f"Invalid page_size_kb, resetting to default")
-                    analysis_data[section][key] = float(default_value)
-            else:
-                analysis_data[section].setdefault(key, default_value)
-
-    # Create local variables with safe values
-    basic = analysis_data['basic']
-    perf = analysis_data['performance']
-    security = analysis_data['security']
-    meta = analysis_data['meta']
-    accessibility = analysis_data['accessibility']
-    resources = analysis_data['resources']
-
-    scores = {}
-
-    # Performance scoring (now completely safe)
-    load_time = basic['load_time']
-    page_size = perf['page_size_kb']
-    requests = perf['requests']
-    dom_depth = perf['dom_depth']
+    basic = analysis_data.basic
+    perf = analysis_data.performance
+    security = analysis_data.security
+    meta = analysis_data.meta
+    accessibility = analysis_data.accessibility
+    resources = analysis_data.resources
+
+    # Content quality is only scored when a word count is supplied, normally the
+    # one counted during the scan's own parse
+    if word_count is None:
+        word_count = -1
+
+    features = (
+        float(basic.load_time),
+        float(perf.page_size_kb),
+        float(perf.requests),
+        float(perf.dom_depth),
+        float(security.https),
+        float(security.hsts),
+        float(security.content_security_policy),
+        float(security.x_frame_options),
+        float(len(meta.title)),
+        float(len(meta.description)),
+        float(meta.viewport),
+        float(bool(meta.canonical)),
+        float(bool(meta.og_tags)),
+        float(meta.has_favicon),
+        float(resources.stylesheets),
+        float(resources.images),
+        float(accessibility.alt_text_images),
+        float(accessibility.lang_attribute),
+        float(accessibility.aria_attributes),
+        float(word_count)
+    )
+
+    return dict(zip(SCORED_CATEGORIES, _score_core(features)))
+
+def _score_core(features):
+    """Score categories from a flat tuple of numeric page features (see SCORE_FEATURES)
+
+    Pure arithmetic on scalars, kept free of dict lookups so the whole ladder
+    runs on local variables. Returns one score per entry in SCORED_CATEGORIES.
+    """
+    (load_time, page_size, requests, dom_depth,
+     https, hsts, csp, x_frame_options,
+     title_length, description_length, viewport, canonical, og_tags, favicon,
+     stylesheets, total_images, alt_images, lang, aria, word_count) = features
 
     # Calculate performance score
     perf_score = 0
@@ -362,94 +695,82 @@ def auto_score_website(analysis_data, response_text=None):
     elif dom_depth > 30:
         perf_score -= 1
 
-    scores['Performance & Speed'] = min(max(1, perf_score // 2), 5)
+    performance = min(max(1, perf_score // 2), 5)
 
     # Security scoring
     sec_score = 1  # Base score
-    sec_score += 3 if security.get('https', False) else 0
+    sec_score += 3 if https else 0
 
     # Other security headers
-    sec_score += 1 if security.get('hsts', False) else 0
-    sec_score += 1 if security.get('content_security_policy', False) else 0
-    sec_score += 1 if security.get('x_frame_options', False) else 0
+    sec_score += 1 if hsts else 0
+    sec_score += 1 if csp else 0
+    sec_score += 1 if x_frame_options else 0
 
-    scores['Security & Compliance'] = min(sec_score, 5)
+    security = min(sec_score, 5)
 
     # SEO scoring
     seo_score = 1  # Base score
 
     # Title check
-    title = meta.get('title', '')
-    if title and 30 <= len(title) <= 60:
+    if 30 <= title_length <= 60:
         seo_score += 2
 
     # Description check
-    description = meta.get('description', '')
-    if description and 50 <= len(description) <= 160:
+    if 50 <= description_length <= 160:
         seo_score += 2
 
     # Viewport is critical for mobile SEO
-    if meta.get('viewport', False):
+    if viewport:
         seo_score += 1
 
     # Canonical URL
-    if meta.get('canonical', ''):
+    if canonical:
         seo_score += 1
 
     # OpenGraph tags
-    if meta.get('og_tags', {}):
+    if og_tags:
         seo_score += 1
 
-    scores['SEO & Visibility'] = min(seo_score, 5)
+    seo = min(seo_score, 5)
 
     # Mobile responsiveness
     mobile_score = 1
-    if meta.get('viewport', False):
+    if viewport:
         mobile_score += 3
 
     # Check for responsive design indicators
-    if resources.get('stylesheets', 0) > 0:
+    if stylesheets > 0:
         mobile_score += 1
 
-    scores['Mobile Responsiveness'] = min(mobile_score, 5)
+    mobile = min(mobile_score, 5)
 
     # First impressions
     first_imp_score = 2  # Base score
 
-    if meta.get('has_favicon', False):
+    if favicon:
         first_imp_score += 1
-    if title:
+    if title_length:
         first_imp_score += 1
-    if description:
+    if description_length:
         first_imp_score += 1
 
-    scores['First Impressions & Branding'] = min(first_imp_score, 5)
+    first_impressions = min(first_imp_score, 5)
 
-    # Content quality (basic assessment)
+    # Content quality (basic assessment, skipped when the word count is unknown)
     content_score = 3  # Default
 
-    # Check for meaningful content (only if response_text is provided)
-    if response_text:
-        try:
-            soup = BeautifulSoup(response_text, 'lxml')
-            text_content = ' '.join([p.get_text() for p in soup.find_all(['p', 'h1', 'h2', 'h3'])])
-            word_count = len(text_content.split())
-
-            if word_count > 500:
-                content_score += 1
-            elif word_count < 100:
-                content_score -= 1
-        except:
-            pass
+    if word_count >= 0:
+        if word_count > 500:
+            content_score += 1
+        elif word_count < 100:
+            content_score -= 1
 
-    scores['Content Quality'] = min(max(1, content_score), 5)
+    content = min(max(1, content_score), 5)
 
     # Accessibility
     accessibility_score = 1  # Base score
 
     # Image alt text
-    total_images = resources.get('images', 0)
-    alt_images = accessibility.get('alt_text_images', 0)
     if total_images > 0:
         alt_ratio = alt_images / total_images
         if alt_ratio > 0.9:
@@ -458,115 +779,116 @@ def auto_score_website(analysis_data, response_text=None):
             accessibility_score += 1
 
     # Language attribute
-    if accessibility.get('lang_attribute', False):
+    if lang:
         accessibility_score += 1
 
     # ARIA attributes
-    if accessibility.get('aria_attributes', 0) > 0:
+    if aria > 0:
         accessibility_score += 1
 
-    scores['Accessibility'] = min(accessibility_score, 5)
+    accessibility = min(accessibility_score, 5)
+
+    return (performance, security, seo, mobile, first_impressions, content, accessibility)
 
-    return scores
+def overall_score(scores, weights):
+    """Weighted mean of category scores"""
+    return float(np.average(scores, weights=weights))
 
 def create_results_dataframe(scores, url):
     """Create DataFrame from scoring results"""
-    data = []
-    for category, score in scores.items():
-        if isinstance(CATEGORIES.get(category, {}), dict):
-            recommendation = CATEGORIES[category]['scores'][score-1]
-        else:
-            recommendation = CATEGORIES.get(category, ["No recommendation available"])[score-1]
-
-        data.append({
-            'Section': category,
-            'Score': score,
-            'Recommendation': recommendation
-        })
-
-    return pd.DataFrame(data)
+    sections = list(scores)
+    score_vals = np.fromiter(scores.values(), dtype=np.int8, count=len(sections))
+    recommendations = [
+        _RECS.get(section, _NO_RECOMMENDATION)[score - 1]
+        for section, score in zip(sections, score_vals)
+    ]
+    # CATEGORIES weights, 1.0 where unset
+    weights = np.fromiter((_WEIGHTS.get(section, 1.0) for section in sections), dtype=np.float32, count=len(sections))
+
+    return pd.DataFrame({
+        'Section': pd.Categorical(sections),
+        'Score': score_vals,
+        'Recommendation': recommendations,
+        'Weight': weights
+    })
+
+def create_styled_spreadsheet(rows, scan_data, url, output):
+    """Write a professionally styled Excel workbook into the output file object
+
+    rows is a sequence of (section, score, recommendation, weight) tuples, one per category.
+    """
+    # Rows are streamed to disk in order, so every cell of a row is written before moving on
+    wb = xlsxwriter.Workbook(output, {'constant_memory': True, 'strings_to_urls': False})
+
+    # Define styles once; cells share these format objects
+    header_fmt = wb.add_format({
+        'bg_color': '#2A5CAA', 'font_color': '#FFFFFF', 'bold': True, 'font_size': 12,
+        'border': 1, 'align': 'center', 'valign': 'vcenter'
+    })
+    row_fmt = wb.add_format({'font_name': 'Calibri', 'font_size': 11, 'border': 1, 'text_wrap': True, 'valign': 'top'})
+    highlight_fmt = wb.add_format({
+        'font_name': 'Calibri', 'font_size': 11, 'border': 1, 'text_wrap': True, 'valign': 'top',
+        'bg_color': '#FFF2CC'
+    })
 
-def create_styled_spreadsheet(df, scan_data, url):
-    """Create professionally styled Excel workbook"""
-    wb = openpyxl.Workbook()
+    # Conditional formatting for scores
+    score_colors = {
+        1: "#FF0000",  # Red
+        2: "#FF6600",  # Orange
+        3: "#FFCC00",  # Yellow
+        4: "#92D050",  # Light green
+        5: "#00B050"   # Dark green
+    }
+    score_fmts = {
+        score: wb.add_format({'bg_color': color, 'bold': True, 'border': 1, 'align': 'center'})
+        for score, color in score_colors.items()
+    }
+    default_score_fmt = wb.add_format({'bg_color': '#FFFFFF', 'bold': True, 'border': 1, 'align': 'center'})
 
     # ===== Scorecard Sheet =====
-    ws = wb.active
-    ws.title = "Scorecard"
+    ws = wb.add_worksheet("Scorecard")
 
-    # Define styles
-    header_fill = PatternFill(start_color="2A5CAA", end_color="2A5CAA", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True, size=12)
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
-                        top=Side(style='thin'), bottom=Side(style='thin'))
-    highlight_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+    # Set column widths
+    ws.set_column('A:A', 28)
+    ws.set_column('B:B', 8)
+    ws.set_column('C:C', 65)
+    ws.set_column('D:D', 12)
+    ws.set_column('E:E', 40)
 
     # Write headers
     headers = ["Category", "Score", "Recommendation", "Priority", "Details"]
-    ws.append(headers)
-
-    # Style headers
-    for col in range(1, len(headers) + 1):
-        cell = ws.cell(row=1, column=col)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.border = thin_border
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+    ws.write_row(0, 0, headers, header_fmt)
 
-    # Conditional formatting for scores
-    score_colors = {
-        1: "FF0000",  # Red
-        2: "FF6600",  # Orange
-        3: "FFCC00",  # Yellow
-        4: "92D050",  # Light green
-        5: "00B050"   # Dark green
-    }
+    scores = [row[1] for row in rows]
+    score_arr = np.asarray(scores)
+    priorities = np.where(score_arr <= 2, "High", np.where(score_arr == 3, "Medium", "Low"))
 
     # Write data with enhanced formatting
-    for idx, row in df.iterrows():
-        ws.append([
-            row['Section'],
-            row['Score'],
-            row['Recommendation'],
-            "High" if row['Score'] in [1, 2] else "Medium" if row['Score'] == 3 else "Low",
-            get_category_details(row['Section'], scan_data)
-        ])
-
-        # Style all cells in row
-        for col in range(1, len(headers) + 1):
-            cell = ws.cell(row=idx+2, column=col)
-            cell.font = Font(name='Calibri', size=11)
-            cell.border = thin_border
-            cell.alignment = Alignment(wrap_text=True, vertical="top")
-
-            if row['Score'] in [1, 2]:
-                cell.fill = highlight_fill
-
-        # Special score cell styling
-        score_cell = ws.cell(row=idx+2, column=2)
-        score_cell.fill = PatternFill(
-            start_color=score_colors.get(row['Score'], "FFFFFF"),
-            end_color=score_colors.get(row['Score'], "FFFFFF"),
-            fill_type="solid"
-        )
-        score_cell.font = Font(bold=True)
-        score_cell.alignment = Alignment(horizontal="center")
+    for row_num, ((section, score, recommendation, _), priority) in enumerate(zip(rows, priorities.tolist()), start=1):
+        cell_fmt = highlight_fmt if score <= 2 else row_fmt
 
-    # Set column widths and row heights
-    ws.column_dimensions['A'].width = 28
-    ws.column_dimensions['B'].width = 8
-    ws.column_dimensions['C'].width = 65
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 40
+        ws.set_row(row_num, 60)
+        ws.write(row_num, 0, section, cell_fmt)
+        ws.write_number(row_num, 1, score, score_fmts.get(score, default_score_fmt))
+        ws.write_row(row_num, 2, [
+            recommendation,
+            priority,
+            get_category_details(section, scan_data)
+        ], cell_fmt)
 
-    for row in range(2, len(df) + 2):
-        ws.row_dimensions[row].height = 60
-
-    ws.freeze_panes = "A2"
-    ws.auto_filter.ref = ws.dimensions
+    ws.freeze_panes(1, 0)
+    ws.autofilter(0, 0, len(rows), len(headers) - 1)
 
     # ===== Scan Details Sheet =====
-    ws2 = wb.create_sheet(title="Scan Details")
+    ws2 = wb.add_worksheet("Scan Details")
+    ws2.set_column('A:A', 28)
+    ws2.set_column('B:B', 50)
+
+    section_fmt = wb.add_format({'bold': True, 'font_size': 14, 'font_color': '#2A5CAA', 'bg_color': '#D9E1F2'})
+    bold_fmt = wb.add_format({'bold': True})
+    link_fmt = wb.add_format({'font_color': '#0563C1', 'underline': 1})
+    yes_fmt = wb.add_format({'font_color': '#00B050'})
+    no_fmt = wb.add_format({'font_color': '#FF0000'})
 
     sections = [
         ("Basic Information", "basic"),
@@ -577,173 +899,190 @@ def create_styled_spreadsheet(df, scan_data, url):
         ("Accessibility Checks", "accessibility")
     ]
 
-    row_num = 1
+    row_num = 0
     for section_name, section_key in sections:
         # Section header
-        ws2.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=2)
-        header_cell = ws2.cell(row=row_num, column=1, value=section_name)
-        header_cell.font = Font(bold=True, size=14, color="2A5CAA")
-        header_cell.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+        ws2.merge_range(row_num, 0, row_num, 1, section_name, section_fmt)
         row_num += 1
 
         # Sub-headers
-        ws2.cell(row=row_num, column=1, value="Metric").font = Font(bold=True)
-        ws2.cell(row=row_num, column=2, value="Value").font = Font(bold=True)
+        ws2.write_row(row_num, 0, ["Metric", "Value"], bold_fmt)
         row_num += 1
 
         # Data rows
-        if section_key in scan_data:
-            for key, value in scan_data[section_key].items():
-                key_cell = ws2.cell(row=row_num, column=1, value=key.replace('_', ' ').title())
-                key_cell.font = Font(bold=False)
-
-                value_cell = ws2.cell(row=row_num, column=2, value=str(value))
+        if hasattr(scan_data, section_key):
+            for key, value in asdict(getattr(scan_data, section_key)).items():
+                ws2.write_string(row_num, 0, key.replace('_', ' ').title())
 
                 if isinstance(value, str) and value.startswith(('http://', 'https://')):
-                    value_cell.hyperlink = value
-                    value_cell.font = Font(color="0563C1", underline="single")
+                    ws2.write_url(row_num, 1, value, link_fmt, string=value)
                 elif isinstance(value, bool):
-                    value_cell.font = Font(color="00B050" if value else "FF0000")
-                    value_cell.value = "Yes" if value else "No"
+                    ws2.write_string(row_num, 1, "Yes" if value else "No", yes_fmt if value else no_fmt)
+                else:
+                    ws2.write_string(row_num, 1, str(value))
 
                 row_num += 1
 
         row_num += 1
 
-    ws2.column_dimensions['A'].width = 28
-    ws2.column_dimensions['B'].width = 50
-    ws2.freeze_panes = "A2"
+    ws2.freeze_panes(1, 0)
 
     # ===== Executive Summary Sheet =====
-    ws3 = wb.create_sheet(title="Summary")
-    ws3.merge_cells(start_row=1, start_column=1, end_row=3, end_column=2)
-    ws3.cell(row=1, column=1, value="Website Review Report").font = Font(bold=True, size=18, color="2A5CAA")
+    ws3 = wb.add_worksheet("Summary")
+    ws3.set_column('A:A', 25)
+    ws3.set_column('B:B', 40)
+
+    title_fmt = wb.add_format({'bold': True, 'font_size': 18, 'font_color': '#2A5CAA'})
+    critical_fmt = wb.add_format({'bold': True, 'font_color': '#FF0000'})
+    subtitle_fmt = wb.add_format({'bold': True, 'font_size': 14, 'font_color': '#2A5CAA'})
+    recommendation_fmt = wb.add_format({'bold': True, 'text_wrap': True})
+
+    ws3.merge_range(0, 0, 2, 1, "Website Review Report", title_fmt)
 
     # Add summary metrics
     summary_metrics = [
         ["Website URL", url],
-        ["Scan Date", scan_data.get('basic', {}).get('scan_timestamp', 'N/A')],
-        ["Overall Score", f"{df['Score'].mean():.1f}/5.0"],
-        ["Page Title", scan_data.get('meta', {}).get('title', 'N/A')],
-        ["Load Time", f"{scan_data.get('basic', {}).get('load_time', 0):.2f} seconds"],
-        ["Page Size", f"{scan_data.get('performance', {}).get('page_size_kb', 0):.1f} KB"],
-        ["Resource Requests", scan_data.get('performance', {}).get('requests', 0)],
-        ["Uses HTTPS", "Yes" if scan_data.get('security', {}).get('https', False) else "No (Critical)"],
-        ["Mobile Ready", "Yes" if scan_data.get('meta', {}).get('viewport', False) else "No"],
-        ["Critical Issues", len(df[df['Score'] == 1])],
-        ["Areas Needing Improvement", len(df[df['Score'] == 2])],
-        ["Well Performing Areas", len(df[df['Score'] >= 4])]
+        ["Scan Date", scan_data.basic.scan_timestamp],
+        ["Overall Score", f"{overall_score(scores, [row[3] for row in rows]):.1f}/5.0"],
+        ["Page Title", scan_data.meta.title],
+        ["Load Time", f"{scan_data.basic.load_time:.2f} seconds"],
+        ["Page Size", f"{scan_data.performance.page_size_kb:.1f} KB"],
+        ["Resource Requests", scan_data.performance.requests],
+        ["Uses HTTPS", "Yes" if scan_data.security.https else "No (Critical)"],
+        ["Mobile Ready", "Yes" if scan_data.meta.viewport else "No"],
+        ["Critical Issues", scores.count(1)],
+        ["Areas Needing Improvement", scores.count(2)],
+        ["Well Performing Areas", sum(score >= 4 for score in scores)]
     ]
 
-    start_row = 5
+    start_row = 4
     for i, (metric, value) in enumerate(summary_metrics, start=start_row):
-        ws3.cell(row=i, column=1, value=metric).font = Font(bold=True)
-        ws3.cell(row=i, column=2, value=value)
-
-        try:
-            if metric == "Uses HTTPS" and str(value).startswith("No"):
-                ws3.cell(row=i, column=2).font = Font(color="FF0000", bold=True)
-        except Exception as e:
-            logger.warning(f"Font styling failed at summary row {i}: {e}")
-
+        ws3.write_string(i, 0, metric, bold_fmt)
+        if metric == "Uses HTTPS" and str(value).startswith("No"):
+            ws3.write(i, 1, value, critical_fmt)
+        else:
+            ws3.write(i, 1, value)
 
     # Add recommendations section
     rec_row = start_row + len(summary_metrics) + 2
-    ws3.cell(row=rec_row, column=1, value="Top Recommendations").font = Font(bold=True, size=14, color="2A5CAA")
+    ws3.write_string(rec_row, 0, "Top Recommendations", subtitle_fmt)
     rec_row += 1
 
-    top_issues = df.nsmallest(3, 'Score')
-    for idx, row in top_issues.iterrows():
-        ws3.cell(row=rec_row, column=1, value=f"• {row['Recommendation']}").font = Font(bold=True)
-        ws3.cell(row=rec_row, column=1).alignment = Alignment(wrap_text=True)
+    # Lowest scores first; the sort is stable, so ties keep category order like nsmallest
+    for _, _, recommendation, _ in sorted(rows, key=lambda row: row[1])[:3]:
+        ws3.write_string(rec_row, 0, f"• {recommendation}", recommendation_fmt)
         rec_row += 1
 
-    ws3.column_dimensions['A'].width = 25
-    ws3.column_dimensions['B'].width = 40
+    wb.close()
+
+def _performance_details(scan_data):
+    basic, performance = scan_data.basic, scan_data.performance
+    return [
+        f"Load Time: {basic.load_time:.2f}s",
+        f"Page Size: {performance.page_size_kb:.1f}KB",
+        f"Requests: {performance.requests}",
+        f"DOM Depth: {performance.dom_depth}"
+    ]
 
-    return wb
+def _security_details(scan_data):
+    security = scan_data.security
+    details = [f"HTTPS: {'Yes' if security.https else 'No'}"]
+    if security.https:
+        details.append(f"HSTS: {'Yes' if security.hsts else 'No'}")
+    details.append(f"CSP Header: {'Yes' if security.content_security_policy else 'No'}")
+    return details
+
+def _mobile_details(scan_data):
+    meta, resources = scan_data.meta, scan_data.resources
+    return [
+        f"Viewport: {'Present' if meta.viewport else 'Missing'}",
+        f"Images: {resources.images}",
+        f"Responsive CSS: {resources.stylesheets} sheets"
+    ]
+
+def _branding_details(scan_data):
+    meta = scan_data.meta
+    return [
+        f"Title: {'Present' if meta.title else 'Missing'}",
+        f"Favicon: {'Present' if meta.has_favicon else 'Missing'}"
+    ]
+
+def _accessibility_details(scan_data):
+    accessibility = scan_data.accessibility
+    return [
+        f"Alt Text: {accessibility.alt_text_images}/{scan_data.resources.images} images",
+        f"ARIA Attributes: {accessibility.aria_attributes}",
+        f"Language: {'Set' if accessibility.lang_attribute else 'Missing'}"
+    ]
+
+def _seo_details(scan_data):
+    meta = scan_data.meta
+    return [
+        f"Title Length: {meta.title_length} chars",
+        f"Description: {'Present' if meta.description else 'Missing'}",
+        f"Viewport: {'Present' if meta.viewport else 'Missing'}"
+    ]
+
+def _content_details(scan_data):
+    word_count = scan_data.performance.text_word_count
+    return [f"Word Count: {word_count if word_count is not None else 'Not scanned'}"]
+
+# Category name -> builder of its detail lines
+_DETAIL_BUILDERS = {
+    "Performance & Speed": _performance_details,
+    "Security & Compliance": _security_details,
+    "Mobile Responsiveness": _mobile_details,
+    "First Impressions & Branding": _branding_details,
+    "Accessibility": _accessibility_details,
+    "SEO & Visibility": _seo_details,
+    "Content Quality": _content_details
+}
 
 def get_category_details(category, scan_data):
-    """Completely safe category details generator with nested .get()"""
-    details = []
+    """Completely safe category details generator"""
+    builder = _DETAIL_BUILDERS.get(category)
+    if builder is None:
+        return ""
 
     try:
-        # Safely access nested dictionaries with .get()
-        basic = scan_data.get('basic', {})
-        performance = scan_data.get('performance', {})
-        security = scan_data.get('security', {})
-        meta = scan_data.get('meta', {})
-        resources = scan_data.get('resources', {})
-        accessibility = scan_data.get('accessibility', {})
-
-        if category == "Performance & Speed":
-            details.extend([
-                f"Load Time: {basic.get('load_time', 0):.2f}s",
-                f"Page Size: {performance.get('page_size_kb', 0):.1f}KB",
-                f"Requests: {performance.get('requests', 0)}",
-                f"DOM Depth: {performance.get('dom_depth', 0)}"
-            ])
-
-        elif category == "Security & Compliance":
-            details.append(f"HTTPS: {'Yes' if security.get('https', False) else 'No'}")
-            if security.get('https', False):
-                details.append(f"HSTS: {'Yes' if security.get('hsts', False) else 'No'}")
-            details.append(f"CSP Header: {'Yes' if security.get('content_security_policy', False) else 'No'}")
-
-        elif category == "Mobile Responsiveness":
-            details.extend([
-                f"Viewport: {'Present' if meta.get('viewport', False) else 'Missing'}",
-                f"Images: {resources.get('images', 0)}",
-                f"Responsive CSS: {resources.get('stylesheets', 0)} sheets"
-            ])
-
-        elif category == "First Impressions & Branding":
-            details.extend([
-                f"Title: {'Present' if meta.get('title', '') else 'Missing'}",
-                f"Favicon: {'Present' if meta.get('has_favicon', False) else 'Missing'}"
-            ])
-
-        elif category == "Accessibility":
-            total_images = resources.get('images', 0)
-            alt_images = accessibility.get('alt_text_images', 0)
-            details.extend([
-                f"Alt Text: {alt_images}/{total_images} images",
-                f"ARIA Attributes: {accessibility.get('aria_attributes', 0)}",
-                f"Language: {'Set' if accessibility.get('lang_attribute', False) else 'Missing'}"
-            ])
-
-        elif category == "SEO & Visibility":
-            details.extend([
-                f"Title Length: {meta.get('title_length', 0)} chars",
-                f"Description: {'Present' if meta.get('description', '') else 'Missing'}",
-                f"Viewport: {'Present' if meta.get('viewport', False) else 'Missing'}"
-            ])
-
+        return "\n".join(builder(scan_data))
     except Exception as e:
-        logger.error(f"Error generating details for {category}: {str(e)}")
-        details.append("Details currently unavailable")
-
-    return "\n".join(details)
-
-def ensure_defaults(scan_data):
-    """Ensures scan_data contains valid values with correct types for all required fields"""
-    defaults = {
-        'basic': {'load_time': 0.0},
-        'performance': {'page_size_kb': 0.0, 'requests': 0, 'dom_depth': 0},
-        'meta': {'viewport': False, 'title': '', 'description': ''},
-        'resources': {'stylesheets': 0},
-        'security': {'https': False},
-        'accessibility': {'alt_text_images': 0, 'aria_attributes': 0, 'lang_attribute': False}
+        logger.error("Error generating details for %s: %s", category, e)
+        return "Details currently unavailable"
+
+def run_full_scan(validated_url):
+    """Scan and score a website; the unit of work behind each background job"""
+    scan_results = scan_website(validated_url)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Full scan results: %s", scan_results)
+    if 'data' not in scan_results:
+        raise ValueError("Invalid scan results format - missing data")
+
+    scan_data = scan_results['data']
+    scores = auto_score_website(scan_data, scan_data.performance.text_word_count)
+    df = create_results_dataframe(scores, validated_url)
+
+    return {
+        'validated_url': validated_url,
+        'scan_data': scan_data,
+        'scores': scores,
+        'df': df
     }
-    for section, fields in defaults.items():
-        sec = scan_data.setdefault(section, {})
-        for key, val in fields.items():
-            # Force override if missing or wrong type
-            if key not in sec or not isinstance(sec[key], type(val)):
-                logger.warning(f"Fixing missing or invalid key: {section}.{key} = {sec.get(key)}")
-                sec[key] = val
-    logger.info(f"Sanitized scan_data: {scan_data}")
-    return scan_data
+
+def run_batch_item(item):
+    """Scan and score one URL of a batch, holding its host's slot for the duration of the scan"""
+    url, host_limit = item
+    with host_limit:
+        scan_results = scan_website(url)
+
+    scan_data = scan_results['data']
+    entry = {'url': url, 'status': scan_results['status'], 'scan_data': asdict(scan_data)}
+    if scan_results['status'] == 'success':
+        entry['scores'] = auto_score_website(scan_data, scan_data.performance.text_word_count)
+    else:
+        entry['error'] = scan_results.get('message', '')
+    return entry
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
@@ -754,80 +1093,183 @@ def index():
 
         try:
             validated_url = validate_url(url)
-            scan_results = scan_website(validated_url)
-
-            logger.info(f"Full scan results: {scan_results}")
-            if 'data' not in scan_results:
-                raise ValueError("Invalid scan results format - missing data")
 
-            scan_data = scan_results.get('data', {})
-            scan_data = ensure_defaults(scan_data)
+            jobs = submit_scans(run_full_scan, [validated_url])
+            if jobs is None:
+                logger.warning("Scan queue full, turning away: %s", validated_url)
+                return render_template('index.html', error="The scanner is busy right now. Please try again in a minute."), 503
 
-            logger.info(f"Post-default performance keys: {scan_data.get('performance', {})}")
+            job_id = uuid.uuid4().hex
+            _SCAN_JOBS.set(job_id, jobs[0])
+            logger.info("Queued scan job %s for: %s", job_id, validated_url)
 
-            if 'page_size_kb' not in scan_data.get('performance', {}):
-                logger.error("page_size_kb STILL missing in performance")
-                scan_data['performance']['page_size_kb'] = 0.0
+            return redirect(url_for('show_results', job_id=job_id))
 
-            scores = auto_score_website(scan_data)
-            df = create_results_dataframe(scores, validated_url)
+        except Exception as e:
+            logger.error("Scan failed: %s", e, exc_info=True)
+            return render_template('index.html', error=str(e))
 
-            session['scan_results'] = {
-                'df': df.to_dict(),
-                'scan_data': scan_data,
-                'validated_url': validated_url
-            }
+    return render_template('index.html')
 
-            chart_data = {
-                'labels': list(scores.keys()),
-                'data': list(scores.values()),
-                'colors': ['#e74c3c', '#e67e22', '#f1c40f', '#2ecc71', '#27ae60']
-            }
+@app.route('/status/<job_id>')
+def scan_status(job_id):
+    job = _SCAN_JOBS.get(job_id)
+    if job is None:
+        return jsonify({'state': 'unknown'}), 404
+
+    if not job.done():
+        return jsonify({'state': 'started' if job.running() else 'queued'})
+
+    error = job.exception()
+    if error is not None:
+        return jsonify({'state': 'failed', 'error': str(error)})
+
+    result = job.result()
+    return jsonify({
+        'state': 'finished',
+        'data': {
+            'url': result['validated_url'],
+            'scores': result['scores'],
+            'scan_data': asdict(result['scan_data'])
+        }
+    })
+
+@app.route('/results/<job_id>')
+def show_results(job_id):
+    job = _SCAN_JOBS.get(job_id)
+    if job is None:
+        return render_template('index.html', error="Scan not found or expired. Please scan again.")
+
+    if not job.done():
+        return render_template('pending.html', job_id=job_id)
 
-            return render_template('results.html',
-                                   url=validated_url,
-                                   scores=scores,
-                                   chart_data=chart_data,
-                                   scan_data=scan_data)
+    try:
+        result = job.result()
+        validated_url = result['validated_url']
+        scan_data = result['scan_data']
+        scores = result['scores']
+        df = result['df']
+
+        # The finished job stays cached server-side; the session only remembers which one
+        session['scan_id'] = job_id
+
+        labels, data = map(list, zip(*scores.items()))
+        # Serialized once here; the template embeds it as-is instead of running tojson per field
+        chart_json = htmlsafe_json_dumps({
+            'labels': labels,
+            'data': data,
+            'colors': _CHART_COLORS
+        })
 
-        except Exception as e:
-            logger.error(f"Scan failed: {str(e)}", exc_info=True)
-            return render_template('index.html', error=str(e))
+        return render_template('results.html',
+                               url=validated_url,
+                               scores=scores,
+                               chart_json=chart_json,
+                               scan_data=scan_data,
+                               overall_score=f"{overall_score(df['Score'], df['Weight']):.1f}",
+                               critical_issues=int((df['Score'] == 1).sum()),
+                               needs_improvement=int((df['Score'] == 2).sum()),
+                               well_performing=int((df['Score'] >= 4).sum()),
+                               recommendations=df.nsmallest(3, 'Score')['Recommendation'].tolist(),
+                               category_recommendations=dict(zip(df['Section'], df['Recommendation'])))
 
-    return render_template('index.html')
+    except Exception as e:
+        logger.error("Scan failed: %s", e, exc_info=True)
+        return render_template('index.html', error=str(e))
+
+@app.route('/batch', methods=['POST'])
+def batch_scan():
+    """Queue a list of URLs for scanning; accepts JSON {"urls": [...]} or a newline-separated 'urls' form field
+
+    Returns a batch id at once; results are collected from /batch/<batch_id>.
+    """
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        urls = payload.get('urls') or []
+        if not isinstance(urls, list):
+            return jsonify({'error': "'urls' must be a list of URLs"}), 400
+    else:
+        urls = request.form.get('urls', '').splitlines()
+    urls = [url.strip() for url in urls if isinstance(url, str) and url.strip()]
+
+    if not urls:
+        return jsonify({'error': "Please provide at least one URL"}), 400
+    if len(urls) > MAX_BATCH_URLS:
+        return jsonify({'error': f"At most {MAX_BATCH_URLS} URLs can be scanned per batch"}), 400
+
+    # Cap parallel requests per host so a batch aimed at one site does not hammer it
+    host_limits = {url_host(url): threading.BoundedSemaphore(MAX_SCANS_PER_HOST) for url in urls}
+    jobs = submit_scans(run_batch_item, [(url, host_limits[url_host(url)]) for url in urls])
+    if jobs is None:
+        return jsonify({'error': "The scanner is busy right now. Please try again in a minute."}), 503
+
+    batch_id = uuid.uuid4().hex
+    _BATCH_JOBS.set(batch_id, jobs)
+    logger.info("Queued batch %s of %s URLs", batch_id, len(urls))
+
+    return jsonify({
+        'batch_id': batch_id,
+        'status_url': url_for('batch_status', batch_id=batch_id)
+    }), 202
+
+@app.route('/batch/<batch_id>')
+def batch_status(batch_id):
+    jobs = _BATCH_JOBS.get(batch_id)
+    if jobs is None:
+        return jsonify({'state': 'unknown'}), 404
+
+    completed = sum(job.done() for job in jobs)
+    if completed < len(jobs):
+        state = 'started' if completed or any(job.running() for job in jobs) else 'queued'
+        return jsonify({'state': state, 'completed': completed, 'total': len(jobs)})
+
+    results = []
+    for job in jobs:
+        error = job.exception()
+        results.append({'status': 'error', 'error': str(error)} if error is not None else job.result())
+
+    return jsonify({'state': 'finished', 'completed': completed, 'total': len(jobs), 'results': results})
 
 @app.route('/download')
 def download_report():
-    if 'scan_results' not in session:
+    job = _SCAN_JOBS.get(session.get('scan_id'))
+    if job is None or not job.done() or job.exception() is not None:
         return redirect(url_for('index'))
 
     try:
-        # Reconstruct DataFrame from session
-        df = pd.DataFrame(session['scan_results']['df'])
-        scan_data = session['scan_results']['scan_data']
-        url = session['scan_results']['validated_url']
-
-        # Create Excel report in memory
-        output = BytesIO()
-        wb = create_styled_spreadsheet(df, scan_data, url)
-        wb.save(output)
+        # Use the cached scan directly
+        result = job.result()
+        df = result['df']
+        rows = list(df[['Section', 'Score', 'Recommendation', 'Weight']].itertuples(index=False, name=None))
+        scan_data = result['scan_data']
+        url = result['validated_url']
+
+        # Build the report in memory, spilling to disk only if it grows large
+        output = SpooledTemporaryFile(max_size=REPORT_SPOOL_SIZE)
+        create_styled_spreadsheet(rows, scan_data, url, output)
+        size = output.tell()
         output.seek(0)
 
         # Create filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
         filename = f"Website_Review_{timestamp}.xlsx"
 
-        return send_file(
+        response = send_file(
             output,
             as_attachment=True,
             download_name=filename,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            etag=False
         )
+        # send_file cannot size a spooled file itself, so the response would otherwise go out chunked
+        response.content_length = size
+        return response
 
     except Exception as e:
-        logger.error(f"Download failed: {str(e)}", exc_info=True)
+        logger.error("Download failed: %s", e, exc_info=True)
         return redirect(url_for('index', error="Failed to generate report"))
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=os.environ.get('DEBUG', False))
\ No newline at end of file
+    debug = os.environ.get('DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(host='0.0.0.0', port=port, debug=debug, threaded=True)
\ No newline at end of file